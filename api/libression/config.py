@@ -1,5 +1,6 @@
 import os
 
+_TRUTHY_ENV_VALUES = frozenset({"1", "true", "yes", "on"})
 
 DEFAULT_CHUNK_BYTE_SIZE = int(
     os.environ.get("DEFAULT_CHUNK_BYTE_SIZE", 1024 * 1024 * 5)
@@ -11,7 +12,9 @@ WEBDAV_URL_PATH = os.environ.get("WEBDAV_URL_PATH", "libression_photos")
 WEBDAV_PRESIGNED_URL_PATH = os.environ.get(
     "WEBDAV_PRESIGNED_URL_PATH", "readonly_libression_photos"
 )
-WEBDAV_VERIFY_SSL = bool(os.environ.get("WEBDAV_VERIFY_SSL", "True").lower() == "true")
+WEBDAV_VERIFY_SSL = (
+    os.environ.get("WEBDAV_VERIFY_SSL", "True").casefold() in _TRUTHY_ENV_VALUES
+)
 
 WEBDAV_CACHE_URL_PATH = os.environ.get(
     "WEBDAV_CACHE_URL_PATH", "libression_photos_cache"
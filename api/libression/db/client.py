@@ -1,15 +1,295 @@
+import contextlib
 import dataclasses
 import datetime
+import functools
+import json
+import operator
 import pathlib
+import queue
 import sqlite3
+import threading
 import typing
-import contextlib
+
 import alembic.command
+import alembic.script
 from alembic.config import Config
 
 import libression.entities.db
 
 
+############################################################################################
+# Static SQL (module-level so each pooled connection's statement cache reuses them)
+############################################################################################
+
+_SELECT_TAGS_SQL = "SELECT id, name FROM tags"
+
+# Targeted lookups (JSON array bound once) for cache misses
+_SELECT_TAGS_BY_IDS_SQL = (
+    "SELECT id, name FROM tags WHERE id IN (SELECT value FROM json_each(?))"
+)
+_SELECT_TAGS_BY_NAMES_SQL = (
+    "SELECT id, name FROM tags WHERE name IN (SELECT value FROM json_each(?))"
+)
+
+
+@functools.lru_cache(maxsize=16)
+def _upsert_tags_sql(row_count: int) -> str:
+    """
+    Multi-row tag upsert (text cached per row count, so full chunks reuse one string)
+    DO UPDATE (a no-op rename) rather than DO NOTHING so RETURNING also yields
+    ids of tags that already existed
+    """
+    return (
+        "INSERT INTO tags (name) VALUES "
+        + ", ".join(["(?)"] * row_count)
+        + " ON CONFLICT(name) DO UPDATE SET name = excluded.name RETURNING id, name"
+    )
+
+
+@functools.lru_cache(maxsize=16)
+def _insert_file_actions_sql(row_count: int) -> str:
+    """Multi-row file_actions insert (text cached per row count, see _upsert_tags_sql)"""
+    placeholders = ", ".join(["(?, ?, ?, ?, ?, ?, ?, ?)"] * row_count)
+    return f"""
+INSERT INTO file_actions (
+    file_entity_uuid,
+    file_key,
+    action_type,
+    thumbnail_key,
+    thumbnail_mime_type,
+    thumbnail_checksum,
+    thumbnail_phash,
+    mime_type
+) VALUES {placeholders}
+RETURNING id, action_created_at
+"""
+
+
+_INSERT_FILE_TAG_SQL = (
+    "INSERT INTO file_tags (file_entity_uuid, tag_id, tags_created_at) VALUES (?, ?, ?)"
+)
+
+_SELECT_LATEST_FILE_ENTITY_UUID_SQL = """
+SELECT file_entity_uuid
+FROM file_actions
+WHERE file_key = ?
+ORDER BY action_created_at DESC, id DESC
+LIMIT 1
+"""
+
+_SELECT_FILE_ENTITY_HISTORY_SQL = """
+SELECT
+    f.*,
+    (
+        SELECT json_group_array(tag_id)
+        FROM file_tags
+        WHERE file_entity_uuid = f.file_entity_uuid
+        AND tags_created_at <= f.action_created_at
+    ) as tag_ids
+FROM file_actions f
+WHERE f.file_entity_uuid = ?
+ORDER BY f.action_created_at DESC, f.id DESC
+"""
+
+_SELECT_TAG_HISTORY_SQL = """
+WITH tag_states AS (
+    SELECT DISTINCT
+        ft.tags_created_at,
+        json_group_array(t.name) as tag_names
+    FROM file_tags ft
+    JOIN tags t ON t.id = ft.tag_id
+    WHERE ft.file_entity_uuid = ?
+    GROUP BY ft.tags_created_at
+)
+SELECT *
+FROM tag_states
+ORDER BY tags_created_at DESC
+"""
+
+# Single bound parameter: JSON array of file_keys (no chunking, one cached statement)
+_SELECT_LATEST_FILE_ENTRIES_BY_KEYS_SQL = """
+WITH requested_keys AS (
+    SELECT value AS file_key FROM json_each(?)
+),
+file_entities AS (
+    -- Get file_entity_uuids for the requested file_keys
+    SELECT DISTINCT file_entity_uuid
+    FROM file_actions
+    WHERE file_key IN (SELECT file_key FROM requested_keys)
+),
+ranked_actions AS (
+    -- Rank actions by recency for each file_entity_uuid
+    SELECT
+        *,
+        ROW_NUMBER() OVER (
+            PARTITION BY file_entity_uuid
+            ORDER BY action_created_at DESC, id DESC
+        ) as action_rank
+    FROM file_actions
+    WHERE file_entity_uuid IN (
+        SELECT file_entity_uuid FROM file_entities
+    )
+),
+latest_actions AS (
+    -- Get only the most recent action for each file entity
+    SELECT *
+    FROM ranked_actions
+    WHERE action_rank = 1
+    AND action_type NOT IN ('DELETE', 'MISSING')  -- Exclude deleted/missing files
+    AND file_key IN (SELECT file_key FROM requested_keys)  -- Only requested file_keys
+)
+SELECT
+    f.*,
+    (
+        -- Tags of the entity's most recent tag snapshot. Correlated per returned
+        -- row so both lookups use the file_tags indexes (joining a materialized
+        -- CTE has no index and degrades to a nested-loop scan)
+        SELECT json_group_array(ft.tag_id)
+        FROM file_tags ft
+        WHERE ft.file_entity_uuid = f.file_entity_uuid
+        AND ft.tags_created_at = (
+            SELECT MAX(tags_created_at)
+            FROM file_tags
+            WHERE file_entity_uuid = f.file_entity_uuid
+        )
+    ) as tag_ids
+FROM latest_actions f
+ORDER BY f.action_created_at DESC, f.id DESC
+"""
+
+# get_file_entries_by_tags fragments ("WITH" + CTEs joined by "," + SELECT
+# + WHERE conditions + GROUP BY); the query text only varies with its shape
+_TAG_SEARCH_LATEST_ACTIONS_CTE = """
+latest_actions AS (
+    -- Latest action per file entity; deleted/missing files are
+    -- dropped after ranking (not before, which would revive them)
+    SELECT *
+    FROM (
+        SELECT
+            *,
+            ROW_NUMBER() OVER (
+                PARTITION BY file_entity_uuid
+                ORDER BY action_created_at DESC, id DESC
+            ) as action_rank
+        FROM file_actions
+    )
+    WHERE action_rank = 1
+    AND action_type NOT IN ('DELETE', 'MISSING')
+)"""
+
+_TAG_SEARCH_LATEST_TAGS_CTE = """
+latest_tags AS (
+    -- Tags of the most recent tag snapshot of each file entity
+    SELECT file_entity_uuid, tag_id
+    FROM (
+        SELECT
+            file_entity_uuid,
+            tag_id,
+            RANK() OVER (
+                PARTITION BY file_entity_uuid
+                ORDER BY tags_created_at DESC
+            ) as tags_rank
+        FROM file_tags
+    )
+    WHERE tags_rank = 1
+)"""
+
+_TAG_SEARCH_SELECT = """
+SELECT
+    f.*,
+    json_group_array(lt.tag_id) FILTER (
+        WHERE lt.tag_id IS NOT NULL  -- LEFT JOIN: files without tags
+    ) as tag_ids
+FROM latest_actions f
+LEFT JOIN latest_tags lt
+    ON lt.file_entity_uuid = f.file_entity_uuid
+"""
+
+# Conditions (params: JSON array of tag ids [, group size])
+_TAG_SEARCH_HAS_ALL = """
+f.file_entity_uuid IN (
+    SELECT file_entity_uuid
+    FROM latest_tags lt
+    WHERE lt.tag_id IN (SELECT value FROM json_each(?))
+    GROUP BY file_entity_uuid
+    HAVING COUNT(DISTINCT lt.tag_id) = ?
+)"""
+_TAG_SEARCH_HAS_NONE = """
+f.file_entity_uuid NOT IN (
+    SELECT file_entity_uuid
+    FROM latest_tags lt
+    WHERE lt.tag_id IN (SELECT value FROM json_each(?))
+)"""
+
+# file_actions columns every file entry query must select, in the order
+# _file_entry_from_db_row unpacks them
+_FILE_ENTRY_COLUMNS = (
+    "file_key",
+    "file_entity_uuid",
+    "action_type",
+    "mime_type",
+    "thumbnail_key",
+    "thumbnail_mime_type",
+    "thumbnail_checksum",
+    "thumbnail_phash",
+    "action_created_at",
+)
+
+# action_type column value -> enum member (plain dict lookup, no Enum __call__ per row)
+_ACTION_BY_VALUE = {
+    action.value: action for action in libression.entities.db.DBFileAction
+}
+
+_FIND_SIMILAR_FILES_SQL = """
+WITH target AS (
+    SELECT thumbnail_checksum, thumbnail_phash
+    FROM file_actions
+    WHERE file_key = ?
+    ORDER BY action_created_at DESC, id DESC
+    LIMIT 1
+),
+candidate_keys AS (
+    -- Index seeks on each hash (idx_files_checksums / idx_files_phash),
+    -- instead of ranking every file in the table
+    SELECT f.file_key
+    FROM target t
+    JOIN file_actions f ON f.thumbnail_checksum = t.thumbnail_checksum
+    UNION
+    SELECT f.file_key
+    FROM target t
+    JOIN file_actions f ON f.thumbnail_phash = t.thumbnail_phash
+),
+latest_states AS (
+    -- Most recent action per candidate file_key (may no longer match)
+    SELECT
+        *,
+        ROW_NUMBER() OVER (
+            PARTITION BY file_key
+            ORDER BY action_created_at DESC, id DESC
+        ) as action_rank
+    FROM file_actions
+    WHERE file_key IN (SELECT file_key FROM candidate_keys)
+)
+SELECT f.*
+FROM latest_states f
+CROSS JOIN target t
+WHERE f.action_rank = 1
+AND f.action_type NOT IN ('DELETE', 'MISSING')
+AND (
+    f.thumbnail_checksum = t.thumbnail_checksum
+    OR f.thumbnail_phash = t.thumbnail_phash
+)
+ORDER BY
+    CASE
+        WHEN f.thumbnail_checksum = t.thumbnail_checksum
+        AND f.thumbnail_phash = t.thumbnail_phash THEN 1
+        WHEN f.thumbnail_checksum = t.thumbnail_checksum THEN 2
+        ELSE 3
+    END,
+    f.action_created_at DESC
+"""
+
+
 @dataclasses.dataclass
 class TagMapping:
     """
@@ -33,103 +313,257 @@ class TagMapping:
 
 
 class DBClient:
-    def __init__(self, db_path: str | pathlib.Path):
+    # Latest migration revision, read from the migration scripts once per process
+    _alembic_head: typing.ClassVar[str | None] = None
+    _alembic_lock: typing.ClassVar[threading.Lock] = threading.Lock()
+
+    def __init__(
+        self,
+        db_path: str | pathlib.Path,
+        max_idle_readers: int = 4,
+        cache_size_kib: int = 64 * 1024,
+        mmap_size_bytes: int = 1024 * 1024 * 1024,
+        busy_timeout_seconds: float = 5.0,
+    ):
+        """
+        Args:
+            db_path: path to the sqlite database file (created + migrated if needed)
+            max_idle_readers: read-only connections kept open for reuse
+            cache_size_kib: page cache per connection (upper bound, grows on demand)
+            mmap_size_bytes: memory-mapped I/O window per connection (0 disables)
+            busy_timeout_seconds: wait on a lock held by another connection/process
+                before raising "database is locked" (SQLite busy_timeout)
+        """
         self.db_path = pathlib.Path(db_path)
+        self.cache_size_kib = cache_size_kib
+        self.mmap_size_bytes = mmap_size_bytes
+        self.busy_timeout_seconds = busy_timeout_seconds
         self._tag_mapping: libression.entities.db.TagMapping | None = (
             None  # Cache for tag lookups
         )
 
-        # Register datetime converter
-        sqlite3.register_converter(
-            "datetime", lambda x: datetime.datetime.fromisoformat(x.decode())
-        )
-
         self._ensure_db()
 
+        # Long-lived connections (setup + PRAGMAs paid once, not per call):
+        # - one writer, serialised by a lock
+        # - a pool of read-only readers (WAL lets them run alongside the writer)
+        self._write_lock = threading.Lock()
+        self._writer = self._connect(readonly=False)
+        self._readers: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue(
+            maxsize=max_idle_readers
+        )
+
     def _ensure_db(self) -> None:
-        """Create database and apply migrations."""
+        """Create database and apply migrations (skipped if already at head)."""
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
 
-        # Setup Alembic config
-        alembic_cfg = Config()
-        alembic_cfg.set_main_option(
-            "script_location",
-            str(pathlib.Path(__file__).parent / "migrations"),
-        )
-        alembic_cfg.set_main_option(
-            "sqlalchemy.url",
-            f"sqlite:///{self.db_path}",
-        )
+        script_location = str(pathlib.Path(__file__).parent / "migrations")
 
-        # Run migrations
-        alembic.command.upgrade(alembic_cfg, "head")
+        with DBClient._alembic_lock:
+            if DBClient._alembic_head is None:
+                DBClient._alembic_head = alembic.script.ScriptDirectory(
+                    script_location
+                ).get_current_head()
+
+            if self._current_db_revision() == DBClient._alembic_head:
+                return  # up to date, no need to run alembic
+
+            # Run migrations
+            alembic_cfg = Config()
+            alembic_cfg.set_main_option("script_location", script_location)
+            alembic_cfg.set_main_option(
+                "sqlalchemy.url",
+                f"sqlite:///{self.db_path}",
+            )
+            alembic.command.upgrade(alembic_cfg, "head")
+
+    def _current_db_revision(self) -> str | None:
+        """Revision recorded by alembic in the db (None for a new database)."""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            row = conn.execute("SELECT version_num FROM alembic_version").fetchone()
+        except sqlite3.OperationalError:  # no alembic_version table yet
+            row = None
+        finally:
+            conn.close()
+        return row[0] if row else None
+
+    def _connect(self, readonly: bool) -> sqlite3.Connection:
+        """Open a connection shareable across threads (access is serialised by the pool)"""
+        if readonly:
+            connection = sqlite3.connect(
+                f"{self.db_path.resolve().as_uri()}?mode=ro",
+                uri=True,
+                timeout=self.busy_timeout_seconds,
+                check_same_thread=False,
+                cached_statements=256,
+            )
+        else:
+            connection = sqlite3.connect(
+                self.db_path,
+                timeout=self.busy_timeout_seconds,
+                check_same_thread=False,
+                cached_statements=256,
+            )
+
+            # Performance and durability settings
+            connection.execute(
+                "PRAGMA journal_mode=WAL"
+            )  # Write-Ahead Logging for better concurrency
+            connection.execute(
+                "PRAGMA synchronous=NORMAL"
+            )  # Good balance of safety and speed
+            connection.execute(
+                "PRAGMA foreign_keys=ON"
+            )  # Enforce foreign key constraints
+
+        # Keep hot pages and query temps (sorts, GROUP BY, CTEs) in memory
+        connection.execute(f"PRAGMA cache_size=-{int(self.cache_size_kib)}")
+        connection.execute(f"PRAGMA mmap_size={int(self.mmap_size_bytes)}")
+        connection.execute("PRAGMA temp_store=MEMORY")
 
-    @contextlib.contextmanager
-    def _get_connection(self) -> typing.Generator[sqlite3.Connection, None, None]:
-        connection = sqlite3.connect(
-            self.db_path,
-            detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES,
-        )
         # Enable dictionary-like row access
         connection.row_factory = sqlite3.Row
 
-        # Performance and durability settings
-        connection.execute(
-            "PRAGMA journal_mode=WAL"
-        )  # Write-Ahead Logging for better concurrency
-        connection.execute(
-            "PRAGMA synchronous=NORMAL"
-        )  # Good balance of safety and speed
-        connection.execute("PRAGMA datetime_precision=6")  # Microsecond precision
-        connection.execute("PRAGMA foreign_keys=ON")  # Enforce foreign key constraints
+        return connection
 
-        yield connection
+    @contextlib.contextmanager
+    def _get_connection(
+        self,
+        readonly: bool = False,
+    ) -> typing.Generator[sqlite3.Connection, None, None]:
+        """
+        Check out a pooled connection: commits on success, rolls back on error
+        - readonly: a reader from the pool (opened on demand, idle ones kept)
+        - otherwise: the single writer (held under the write lock)
+        """
+        if not readonly:
+            with self._write_lock:
+                try:
+                    yield self._writer
+                    self._writer.commit()
+                except BaseException:
+                    self._writer.rollback()
+                    # Tag ids merged during the failed transaction no longer exist
+                    self._tag_mapping = None
+                    raise
+            return
 
-        connection.commit()
-        connection.close()
+        try:
+            connection = self._readers.get_nowait()
+        except queue.Empty:
+            connection = self._connect(readonly=True)
+
+        try:
+            yield connection
+            connection.commit()  # end the read transaction
+        except BaseException:
+            connection.rollback()
+            raise
+        finally:
+            try:
+                self._readers.put_nowait(connection)
+            except queue.Full:
+                connection.close()
+
+    def close(self) -> None:
+        """Close all pooled connections (client is unusable afterwards)"""
+        with self._write_lock:
+            self._writer.close()
+
+        while True:
+            try:
+                self._readers.get_nowait().close()
+            except queue.Empty:
+                break
 
     ############################################################################################
     # tags and file_tags tables
     ############################################################################################
 
     def _cache_tag_mapping(
-        self, cursor: sqlite3.Cursor, force_update: bool
+        self, cursor: sqlite3.Cursor
     ) -> libression.entities.db.TagMapping:
         """
         requires a connected cursor
-        syncs tags from the database (registers new tags)
+        loads all tags on first use (later misses are merged in by the _sync/_lookup helpers)
         """
-        if self._tag_mapping is None or force_update:
+        if self._tag_mapping is None:
             self._tag_mapping = libression.entities.db.TagMapping.from_rows(
-                cursor.execute("SELECT id, name FROM tags").fetchall()
+                cursor.execute(_SELECT_TAGS_SQL)
             )
         return self._tag_mapping
 
+    def _sync_tags_by_tag_ids(
+        self,
+        tag_ids: typing.Iterable[int],
+        cursor: sqlite3.Cursor,
+    ) -> libression.entities.db.TagMapping:
+        """
+        Ensure tag ids are in the cached mapping (read only, never inserts)
+        lazy syncs (only fetches the missing ids, merged into the cache)
+        """
+        tag_mapping = self._cache_tag_mapping(cursor)
+
+        missing_ids = set(tag_ids).difference(tag_mapping.id_to_name.keys())
+        if missing_ids:
+            tag_mapping.add_rows(
+                cursor.execute(
+                    _SELECT_TAGS_BY_IDS_SQL, (json.dumps(list(missing_ids)),)
+                )
+            )
+
+        return tag_mapping
+
+    def _lookup_tags_by_tag_names(
+        self,
+        tag_names: typing.Iterable[str],
+        cursor: sqlite3.Cursor,
+    ) -> libression.entities.db.TagMapping:
+        """
+        Read-only counterpart of _sync_tags_by_tag_names
+        Fetches names missing from the cache (unknown names stay missing)
+        """
+        tag_mapping = self._cache_tag_mapping(cursor)
+
+        missing_names = set(tag_names).difference(tag_mapping.name_to_id.keys())
+        if missing_names:
+            tag_mapping.add_rows(
+                cursor.execute(
+                    _SELECT_TAGS_BY_NAMES_SQL, (json.dumps(list(missing_names)),)
+                )
+            )
+
+        return tag_mapping
+
     def _sync_tags_by_tag_names(
         self,
         tag_names: list[str],
         cursor: sqlite3.Cursor,
+        chunk_size: int = 900,  # under SQLite's default 999 bound parameters
     ) -> libression.entities.db.TagMapping:
         """
         Ensure tags exist in the database
         lazy syncs (only calls db when missing tags)
         """
 
-        offline_tag_mapping = self._cache_tag_mapping(cursor, force_update=False)
+        offline_tag_mapping = self._cache_tag_mapping(cursor)
 
         missing_tags = set(tag_names) - set(offline_tag_mapping.name_to_id.keys())
 
         if not missing_tags:
             return offline_tag_mapping  # no need to call db
 
-        cursor.executemany(
-            # If clashes in name, safely ignore (as the tag is already registered)
-            # could be that offline_tag_mapping is out of sync, but we don't care
-            "INSERT OR IGNORE INTO tags (name) VALUES (?)",
-            [(name,) for name in missing_tags],
-        )
+        # Upsert only the missing names and merge the returned (id, name) rows,
+        # instead of reloading the whole tags table
+        missing_tags_list = list(missing_tags)
+        for i in range(0, len(missing_tags_list), chunk_size):
+            chunk = missing_tags_list[i : i + chunk_size]
+            offline_tag_mapping.add_rows(
+                cursor.execute(_upsert_tags_sql(len(chunk)), chunk).fetchall()
+            )
 
-        return self._cache_tag_mapping(cursor, force_update=True)
+        return offline_tag_mapping
 
     def _insert_file_tags(
         self,
@@ -150,16 +584,19 @@ class DBClient:
             datetime.UTC
         )  # grouped by file_entity_uuid timestamp (point of insert)
 
-        for entry in entries:
-            tag_mapping = self._sync_tags_by_tag_names(list(entry.tags), cursor)
+        # Sync the union of all tag names once (not per entry)
+        tag_mapping = self._sync_tags_by_tag_names(
+            list(set().union(*(entry.tags for entry in entries))), cursor
+        )
 
+        for entry in entries:
             for tag_name in entry.tags:
                 tag_id = tag_mapping.name_to_id[tag_name]
                 tag_params.append((entry.file_entity_uuid, tag_id, tags_created_at))
 
         if tag_params:  # Only execute if we have tags to insert
             cursor.executemany(
-                "INSERT INTO file_tags (file_entity_uuid, tag_id, tags_created_at) VALUES (?, ?, ?)",
+                _INSERT_FILE_TAG_SQL,
                 tag_params,
             )
 
@@ -184,43 +621,53 @@ class DBClient:
         self,
         entries: list[libression.entities.db.DBFileEntry],
         cursor: sqlite3.Cursor,
+        chunk_size: int = 900 // 8,  # 8 bound columns per row (SQLite variable limit)
     ) -> list[tuple[int, datetime.datetime]]:
-        """Insert entries into file_actions table and return (id, action_created_at) pairs."""
-        return [
-            cursor.execute(
-                """
-                INSERT INTO file_actions (
-                    file_entity_uuid,
-                    file_key,
-                    action_type,
-                    thumbnail_key,
-                    thumbnail_mime_type,
-                    thumbnail_checksum,
-                    thumbnail_phash,
-                    mime_type
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                RETURNING id, action_created_at;
-                """,
-                (
-                    entry.file_entity_uuid,
-                    entry.file_key,
-                    entry.action_type.value,
-                    entry.thumbnail_key,
-                    entry.thumbnail_mime_type,
-                    entry.thumbnail_checksum,
-                    entry.thumbnail_phash,
-                    entry.mime_type,
-                ),
-            ).fetchone()
-            for entry in entries
-        ]
+        """
+        Insert entries into file_actions table and return (id, action_created_at) pairs.
+        One multi-row INSERT ... RETURNING per chunk (executemany drops RETURNING rows).
+        Pairs are returned in the same order as entries.
+        """
+        created_at_ids: list[tuple[int, datetime.datetime]] = []
 
-    def register_file_action(
+        for i in range(0, len(entries), chunk_size):
+            chunk = entries[i : i + chunk_size]
+
+            params: list[typing.Any] = []
+            for entry in chunk:
+                params.extend(
+                    (
+                        entry.file_entity_uuid,
+                        entry.file_key,
+                        entry.action_type.value,
+                        entry.thumbnail_key,
+                        entry.thumbnail_mime_type,
+                        entry.thumbnail_checksum,
+                        entry.thumbnail_phash,
+                        entry.mime_type,
+                    )
+                )
+
+            rows = cursor.execute(
+                _insert_file_actions_sql(len(chunk)), params
+            ).fetchall()
+
+            # RETURNING order is unspecified; ids follow VALUES order
+            created_at_ids.extend(
+                (row[0], datetime.datetime.fromisoformat(row[1]))
+                for row in sorted(rows, key=lambda row: row[0])
+            )
+
+        return created_at_ids
+
+    def register_files(
         self,
         entries: list[libression.entities.db.DBFileEntry],
+        register_tags: bool,
     ) -> list[libression.entities.db.DBFileEntry]:
         """
-        Insert entries into file_actions tables (NOT file_tags)
+        Insert entries into file_actions (and optionally each entry's tags into file_tags)
+        in a single transaction (one commit for the whole batch).
         Returns the fully populated objects (with ids, timestamps, etc.).
         """
         if not entries:
@@ -232,169 +679,146 @@ class DBClient:
 
             created_at_ids = self._insert_file_actions(entries, cursor)
 
-            registered_entries = []
-            for i, entry in enumerate(entries):
-                entry_dict = entry._asdict()
-                entry_dict["action_created_at"] = created_at_ids[i][
-                    1
-                ]  # Update instead of add
-                registered_entries.append(
-                    libression.entities.db.DBFileEntry.from_dict(entry_dict)
+            registered_entries = [
+                entry._replace(action_created_at=action_created_at)
+                for entry, (_, action_created_at) in zip(entries, created_at_ids)
+            ]
+
+            if register_tags:
+                self._insert_file_tags(
+                    [
+                        libression.entities.db.DBTagEntry(
+                            file_entity_uuid=entry.file_entity_uuid,
+                            tags=entry.tags,
+                        )
+                        for entry in registered_entries
+                    ],
+                    cursor,
                 )
 
             return registered_entries
 
+    def register_file_action(
+        self,
+        entries: list[libression.entities.db.DBFileEntry],
+    ) -> list[libression.entities.db.DBFileEntry]:
+        """
+        Insert entries into file_actions tables (NOT file_tags)
+        Returns the fully populated objects (with ids, timestamps, etc.).
+        """
+        return self.register_files(entries, register_tags=False)
+
     ############################################################################################
     # query methods
     ############################################################################################
 
     def _file_entry_from_db_row(
         self,
-        row: sqlite3.Row,
-        cursor: sqlite3.Cursor,
+        values: tuple,
+        tags: list[str] | None,
     ) -> libression.entities.db.DBFileEntry:
         """
-        Parses a row from the file_actions table into a DBFileEntry object.
-
-        Checks mandatory fields:
-        - file_entity_uuid
-        - file_key
-        - action_type (to DBFileAction enum)
-        - action_created_at
-
-        Fields that are parsed unchecked:
-        - mime_type
-        - thumbnail_key
-        - thumbnail_checksum
-        - thumbnail_phash
-
-        Tags are parsed from tag_ids (str(list[int])) to tag_names (list[str])
-        Requires connected cursor (for lazy cache of tag_mapping)
-        """
-        row_dict = dict(row)
-
-        mandatory_fields = [
-            "file_entity_uuid",
-            "file_key",
-            "action_type",
-            "action_created_at",
-        ]
+        Builds a DBFileEntry from a file_actions row's values, picked in
+        _FILE_ENTRY_COLUMNS order (columns are checked once per cursor in _rows_to_entries)
 
-        if any([x not in row_dict for x in mandatory_fields]):
-            raise ValueError("Missing required fields in row!")
+        action_type is parsed to the DBFileAction enum
+        action_created_at is parsed from its ISO string (no sqlite3 type detection)
 
-        row_dict["action_type"] = libression.entities.db.DBFileAction(
-            row_dict["action_type"]
+        Tags are already resolved to names by the caller (see _rows_to_entries)
+        """
+        (
+            file_key,
+            file_entity_uuid,
+            action_type,
+            mime_type,
+            thumbnail_key,
+            thumbnail_mime_type,
+            thumbnail_checksum,
+            thumbnail_phash,
+            action_created_at,
+        ) = values
+
+        return libression.entities.db.DBFileEntry(
+            file_key=file_key,
+            file_entity_uuid=file_entity_uuid,
+            action_type=_ACTION_BY_VALUE[action_type],
+            mime_type=mime_type,
+            thumbnail_key=thumbnail_key,
+            thumbnail_mime_type=thumbnail_mime_type,
+            thumbnail_checksum=thumbnail_checksum,
+            thumbnail_phash=thumbnail_phash,
+            tags=() if tags is None else tags,
+            action_created_at=(
+                datetime.datetime.fromisoformat(action_created_at)
+                if action_created_at
+                else None
+            ),
         )
 
-        # Handle tags
-        if "tag_ids" in row_dict:
-            tag_ids = row_dict.pop("tag_ids")
-
-            if not tag_ids:  # empty string or None in tag_ids (no tags...)
-                return libression.entities.db.DBFileEntry.from_dict(
-                    row_dict
-                )  # early bail
-
-            itemised_tag_ids = tag_ids.split(",")
+    def _rows_to_entries(
+        self,
+        rows: sqlite3.Cursor,
+    ) -> list[libression.entities.db.DBFileEntry]:
+        """
+        Parses an executed cursor into DBFileEntry objects (see _file_entry_from_db_row)
+        Rows are streamed from the cursor (no intermediate fetchall list) as plain
+        tuples, with column positions resolved once from the cursor description
 
-            tag_mapping = self._cache_tag_mapping(cursor, force_update=False)
+        Tags are parsed from tag_ids (JSON array of ints) to tag_names (list[str])
+        Unknown tag ids are fetched into the cached tag_mapping (see _sync_tags_by_tag_ids)
+        """
+        column_index = {
+            column[0]: index for index, column in enumerate(rows.description)
+        }
+        if not column_index.keys() >= set(_FILE_ENTRY_COLUMNS):
+            raise ValueError("Missing required fields in row!")
+        get_entry_values = operator.itemgetter(
+            *(column_index[column] for column in _FILE_ENTRY_COLUMNS)
+        )
+        tag_ids_index = column_index.get("tag_ids")
 
-            if set(int(tag_id) for tag_id in itemised_tag_ids) - set(
-                tag_mapping.id_to_name.keys()
-            ):
-                tag_mapping = self._cache_tag_mapping(cursor, force_update=True)
+        rows.row_factory = None  # tuples instead of sqlite3.Row (read positionally)
 
-            row_dict["tags"] = [
-                tag_mapping.id_to_name[int(tag_id)] for tag_id in itemised_tag_ids
-            ]
+        id_to_name = self._cache_tag_mapping(rows.connection.cursor()).id_to_name
 
-        return libression.entities.db.DBFileEntry.from_dict(row_dict)
+        entries = []
+        for row in rows:
+            tags = None
+            tag_ids = row[tag_ids_index] if tag_ids_index is not None else None
+            itemised_tag_ids = json.loads(tag_ids) if tag_ids else None
+            if itemised_tag_ids:  # None or empty array (no tags...)
+                try:
+                    tags = [id_to_name[tag_id] for tag_id in itemised_tag_ids]
+                except KeyError:
+                    # Separate cursor: `rows` is still being iterated
+                    id_to_name = self._sync_tags_by_tag_ids(
+                        itemised_tag_ids, rows.connection.cursor()
+                    ).id_to_name
+                    tags = [id_to_name[tag_id] for tag_id in itemised_tag_ids]
+
+            entries.append(self._file_entry_from_db_row(get_entry_values(row), tags))
+
+        return entries
 
     def get_file_entries_by_file_keys(
         self,
         file_keys: list[str],
-        chunk_size: int = 900,
     ) -> list[libression.entities.db.DBFileEntry]:
         """
-        Get current states of multiple files in chunks to avoid SQLite limits.
-        Default chunk_size of 900 is conservative and safe for most SQLite builds.
+        Get current states of multiple files.
+        file_keys are bound as one JSON array (no SQLite variable limit to chunk around).
         Only returns entries where the most recent action is not DELETE.
         """
         if not file_keys:
             return []
 
-        results = []
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("BEGIN IMMEDIATE")
-
-            # Process in chunks to avoid SQLite variable limits
-            for i in range(0, len(file_keys), chunk_size):
-                chunk = file_keys[i : i + chunk_size]
-                placeholders = ",".join(["?"] * len(chunk))
-
-                query = """
-                WITH file_entities AS (
-                    -- Get file_entity_uuids for the requested file_keys
-                    SELECT DISTINCT file_entity_uuid
-                    FROM file_actions
-                    WHERE file_key IN ({})
-                ),
-                ranked_actions AS (
-                    -- Rank actions by recency for each file_entity_uuid
-                    SELECT
-                        *,
-                        ROW_NUMBER() OVER (
-                            PARTITION BY file_entity_uuid
-                            ORDER BY action_created_at DESC, id DESC
-                        ) as action_rank
-                    FROM file_actions
-                    WHERE file_entity_uuid IN (
-                        SELECT file_entity_uuid FROM file_entities
-                    )
-                ),
-                latest_actions AS (
-                    -- Get only the most recent action for each file entity
-                    SELECT *
-                    FROM ranked_actions
-                    WHERE action_rank = 1
-                    AND action_type NOT IN ('DELETE', 'MISSING')  -- Exclude deleted/missing files
-                    AND file_key IN ({})  -- Only return requested file_keys
-                ),
-                latest_tags AS (
-                    -- Get latest tags for each file entity
-                    SELECT
-                        ft.file_entity_uuid,
-                        GROUP_CONCAT(ft.tag_id) as tag_ids
-                    FROM file_tags ft
-                    JOIN (
-                        SELECT
-                            file_entity_uuid,
-                            MAX(tags_created_at) as max_created
-                        FROM file_tags
-                        GROUP BY file_entity_uuid, tag_id
-                    ) lt ON ft.file_entity_uuid = lt.file_entity_uuid
-                        AND ft.tags_created_at = lt.max_created
-                    GROUP BY ft.file_entity_uuid
-                )
-                SELECT
-                    f.*,
-                    COALESCE(lt.tag_ids, '') as tag_ids
-                FROM latest_actions f
-                LEFT JOIN latest_tags lt
-                    ON lt.file_entity_uuid = f.file_entity_uuid
-                ORDER BY f.action_created_at DESC, f.id DESC
-                """.format(placeholders, placeholders)  # Need placeholders twice
-
-                rows = cursor.execute(
-                    query, chunk + chunk
-                ).fetchall()  # Pass chunk twice for both IN clauses
-                results.extend(
-                    [self._file_entry_from_db_row(row, cursor) for row in rows]
+        with self._get_connection(readonly=True) as conn:
+            return self._rows_to_entries(
+                conn.execute(
+                    _SELECT_LATEST_FILE_ENTRIES_BY_KEYS_SQL,
+                    (json.dumps(file_keys),),
                 )
-
-        return results
+            )
 
     def get_file_entries_by_tags(
         self,
@@ -430,116 +854,77 @@ class DBClient:
         if all_include_tags.intersection(exclude_tags):
             raise ValueError("Include and exclude tags cannot overlap!")
 
-        with self._get_connection() as conn:
+        with self._get_connection(readonly=True) as conn:
             cursor = conn.cursor()
 
-            # Base query with latest actions and tags
-            query = """
-            WITH latest_actions AS (
-                -- Get latest non-deleted action for each file
-                SELECT
-                    file_entity_uuid,
-                    file_key,
-                    MAX(action_created_at) as latest_action
-                FROM file_actions
-                WHERE action_type NOT IN ('DELETE', 'MISSING')
-                GROUP BY file_entity_uuid
-            ),
-            latest_tags AS (
-                -- Get latest tags for each file
-                SELECT
-                    file_entity_uuid,
-                    tag_id,
-                    MAX(tags_created_at) as max_created
-                FROM file_tags
-                GROUP BY file_entity_uuid, tag_id
+            # Resolve names from the cached mapping (fetching only missing names)
+            tag_mapping = self._lookup_tags_by_tag_names(
+                all_include_tags.union(exclude_tags), cursor
             )
-            SELECT
-                f.*,
-                GROUP_CONCAT(lt.tag_id) as tag_ids
-            FROM file_actions f
-            JOIN latest_actions la
-                ON f.file_entity_uuid = la.file_entity_uuid
-                AND f.action_created_at = la.latest_action
-            LEFT JOIN latest_tags lt
-                ON lt.file_entity_uuid = f.file_entity_uuid
-            """
+
+            # Include groups whose tags all exist (an unknown tag in a group means
+            # the group can never match: AND within group); an empty group
+            # matches nothing either
+            include_id_groups = [
+                [tag_mapping.name_to_id[tag] for tag in group]
+                for group in include_tag_groups
+                if group and all(tag in tag_mapping.name_to_id for tag in group)
+            ]
+            if include_tag_groups and not include_id_groups:
+                return []  # no group can match
+
+            # Unknown exclude tags can't be on any file (nothing to exclude)
+            exclude_ids = [
+                tag_mapping.name_to_id[tag]
+                for tag in exclude_tags
+                if tag in tag_mapping.name_to_id
+            ]
 
             conditions = []
-            params = []
+            params: list[int | str] = []
 
-            if include_tag_groups:
+            if include_id_groups:
                 include_conditions = []
-
-                for group in include_tag_groups:
-                    # Get tag IDs for this group
-                    placeholders = ",".join("?" * len(group))
-                    cursor.execute(
-                        f"SELECT id FROM tags WHERE name IN ({placeholders})",
-                        list(group),
-                    )
-                    group_ids = [row["id"] for row in cursor.fetchall()]
-
+                for group_ids in include_id_groups:
                     # Must have ALL tags in this group
-                    include_conditions.append(f"""
-                        f.file_entity_uuid IN (
-                            SELECT file_entity_uuid
-                            FROM latest_tags lt
-                            WHERE lt.tag_id IN ({",".join("?" * len(group_ids))})
-                            GROUP BY file_entity_uuid
-                            HAVING COUNT(DISTINCT lt.tag_id) = {len(group_ids)}
-                        )
-                    """)
-                    params.extend(group_ids)
+                    include_conditions.append(_TAG_SEARCH_HAS_ALL)
+                    params.extend([json.dumps(group_ids), len(group_ids)])
 
                 # OR between groups
-                if include_conditions:
-                    conditions.append("(" + " OR ".join(include_conditions) + ")")
-
-            if exclude_tags:
-                # Get tag IDs for exclude tags
-                placeholders = ",".join("?" * len(exclude_tags))
-                cursor.execute(
-                    f"SELECT id FROM tags WHERE name IN ({placeholders})",
-                    list(exclude_tags),
-                )
-                exclude_ids = [row["id"] for row in cursor.fetchall()]
+                conditions.append("(" + " OR ".join(include_conditions) + ")")
 
+            if exclude_ids:
                 # Must not have ANY of these tags
-                conditions.append(f"""
-                    f.file_entity_uuid NOT IN (
-                        SELECT file_entity_uuid
-                        FROM latest_tags lt
-                        WHERE lt.tag_id IN ({",".join("?" * len(exclude_ids))})
-                    )
-                """)
-                params.extend(exclude_ids)
+                conditions.append(_TAG_SEARCH_HAS_NONE)
+                params.append(json.dumps(exclude_ids))
+
+            # Base query with latest actions and tags
+            query = (
+                "WITH"
+                + _TAG_SEARCH_LATEST_ACTIONS_CTE
+                + ","
+                + _TAG_SEARCH_LATEST_TAGS_CTE
+                + _TAG_SEARCH_SELECT
+            )
 
             if conditions:
                 query += " WHERE " + " AND ".join(conditions)
 
-            query += " GROUP BY f.id"  # Add GROUP BY for tag_ids concatenation
+            query += " GROUP BY f.id"  # Add GROUP BY for tag_ids aggregation
 
-            rows = cursor.execute(query, params).fetchall()
-            return [self._file_entry_from_db_row(row, cursor) for row in rows]
+            return self._rows_to_entries(cursor.execute(query, params))
 
     def get_file_history(
         self, file_key: str
     ) -> list[libression.entities.db.DBFileEntry]:
         """Get history of file actions (CREATE/UPDATE/MOVE/DELETE)."""
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("BEGIN IMMEDIATE")
+        with self._get_connection(readonly=True) as conn:
+            # Deferred: one read snapshot for both queries, no write lock
+            conn.execute("BEGIN")
 
             # First get the entity_uuid from most recent state
-            latest = cursor.execute(
-                """
-                SELECT file_entity_uuid
-                FROM file_actions
-                WHERE file_key = ?
-                ORDER BY action_created_at DESC, id DESC
-                LIMIT 1
-                """,
+            latest = conn.execute(
+                _SELECT_LATEST_FILE_ENTITY_UUID_SQL,
                 (file_key,),
             ).fetchone()
 
@@ -547,41 +932,21 @@ class DBClient:
                 return []
 
             # Get all actions for this file entity
-            rows = cursor.execute(
-                """
-                SELECT
-                    f.*,
-                    (
-                        SELECT GROUP_CONCAT(tag_id)
-                        FROM file_tags
-                        WHERE file_entity_uuid = f.file_entity_uuid
-                        AND tags_created_at <= f.action_created_at
-                    ) as tag_ids
-                FROM file_actions f
-                WHERE f.file_entity_uuid = ?
-                ORDER BY f.action_created_at DESC, f.id DESC
-                """,
-                (latest["file_entity_uuid"],),
-            ).fetchall()
-
-            return [self._file_entry_from_db_row(row, cursor) for row in rows]
+            return self._rows_to_entries(
+                conn.execute(
+                    _SELECT_FILE_ENTITY_HISTORY_SQL,
+                    (latest["file_entity_uuid"],),
+                )
+            )
 
     def get_tag_history(
         self, file_key: str
     ) -> list[tuple[datetime.datetime, set[str]]]:
         """Get history of tag changes for a file."""
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-
+        with self._get_connection(readonly=True) as conn:
             # First get the entity_uuid
-            latest = cursor.execute(
-                """
-                SELECT file_entity_uuid
-                FROM file_actions
-                WHERE file_key = ?
-                ORDER BY action_created_at DESC, id DESC
-                LIMIT 1
-                """,
+            latest = conn.execute(
+                _SELECT_LATEST_FILE_ENTITY_UUID_SQL,
                 (file_key,),
             ).fetchone()
 
@@ -589,76 +954,25 @@ class DBClient:
                 return []
 
             # Get distinct tag states
-            rows = cursor.execute(
-                """
-                WITH tag_states AS (
-                    SELECT DISTINCT
-                        ft.tags_created_at,
-                        GROUP_CONCAT(t.name) as tag_names
-                    FROM file_tags ft
-                    JOIN tags t ON t.id = ft.tag_id
-                    WHERE ft.file_entity_uuid = ?
-                    GROUP BY ft.tags_created_at
-                )
-                SELECT *
-                FROM tag_states
-                ORDER BY tags_created_at DESC
-                """,
-                (latest["file_entity_uuid"],),
-            ).fetchall()
-
             return [
-                (row["tags_created_at"], set(row["tag_names"].split(",")))
-                for row in rows
+                (
+                    datetime.datetime.fromisoformat(row["tags_created_at"]),
+                    set(json.loads(row["tag_names"])),
+                )
+                for row in conn.execute(
+                    _SELECT_TAG_HISTORY_SQL,
+                    (latest["file_entity_uuid"],),
+                )
             ]
 
     def find_similar_files(
         self, file_key: str
     ) -> list[libression.entities.db.DBFileEntry]:
         """Find similar files using both checksum and phash."""
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("BEGIN IMMEDIATE")
-
-            rows = cursor.execute(
-                """
-                WITH target AS (
-                    SELECT thumbnail_checksum, thumbnail_phash
-                    FROM file_actions
-                    WHERE file_key = ?
-                    ORDER BY action_created_at DESC
-                    LIMIT 1
-                ),
-                latest_states AS (
-                    SELECT
-                        file_key,
-                        action_type,
-                        thumbnail_checksum,
-                        thumbnail_phash,
-                        MAX(action_created_at) as latest_at
-                    FROM file_actions
-                    GROUP BY file_key
+        with self._get_connection(readonly=True) as conn:
+            return self._rows_to_entries(
+                conn.execute(
+                    _FIND_SIMILAR_FILES_SQL,
+                    (file_key,),
                 )
-                SELECT f.*
-                FROM file_actions f
-                JOIN latest_states ls ON f.file_key = ls.file_key
-                    AND f.action_created_at = ls.latest_at
-                CROSS JOIN target t
-                WHERE ls.action_type NOT IN ('DELETE', 'MISSING')
-                AND (
-                    ls.thumbnail_checksum = t.thumbnail_checksum
-                    OR ls.thumbnail_phash = t.thumbnail_phash
-                )
-                ORDER BY
-                    CASE
-                        WHEN ls.thumbnail_checksum = t.thumbnail_checksum
-                        AND ls.thumbnail_phash = t.thumbnail_phash THEN 1
-                        WHEN ls.thumbnail_checksum = t.thumbnail_checksum THEN 2
-                        ELSE 3
-                    END,
-                    f.action_created_at DESC
-            """,
-                (file_key,),
-            ).fetchall()
-
-            return [self._file_entry_from_db_row(row, cursor) for row in rows]
+            )
@@ -0,0 +1,38 @@
+"""Latest-state indexes
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-16 10:00:00.000000
+"""
+
+from alembic import op
+
+revision = "002"
+down_revision = "001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # "Latest action per file entity" (PARTITION BY uuid ORDER BY created_at, id)
+    # id is the rowid, so it is implicitly the last index column
+    # (supersedes the single-column idx_file_entity_uuid, which is its prefix)
+    op.create_index(
+        "idx_file_actions_entity_time",
+        "file_actions",
+        ["file_entity_uuid", "action_created_at"],
+    )
+    op.drop_index("idx_file_entity_uuid", table_name="file_actions")
+
+    # "Latest tag snapshot per file entity" (MAX/ORDER BY tags_created_at)
+    op.create_index(
+        "idx_file_tags_entity_time",
+        "file_tags",
+        ["file_entity_uuid", "tags_created_at"],
+    )
+
+
+def downgrade():
+    op.drop_index("idx_file_tags_entity_time", table_name="file_tags")
+    op.create_index("idx_file_entity_uuid", "file_actions", ["file_entity_uuid"])
+    op.drop_index("idx_file_actions_entity_time", table_name="file_actions")
@@ -19,14 +19,17 @@ class TagMapping:
     id_to_name: dict[int, str]
 
     @classmethod
-    def from_rows(cls, rows: typing.Sequence[sqlite3.Row]) -> "TagMapping":
+    def from_rows(cls, rows: typing.Iterable[sqlite3.Row]) -> "TagMapping":
         """Create mapping from database rows."""
-        name_to_id = {}
-        id_to_name = {}
+        mapping = cls({}, {})
+        mapping.add_rows(rows)
+        return mapping
+
+    def add_rows(self, rows: typing.Iterable[sqlite3.Row]) -> None:
+        """Merge (id, name) rows into the mapping in place."""
         for row in rows:
-            name_to_id[row["name"]] = row["id"]
-            id_to_name[row["id"]] = row["name"]
-        return cls(name_to_id, id_to_name)
+            self.name_to_id[row["name"]] = row["id"]
+            self.id_to_name[row["id"]] = row["name"]
 
 
 class DBFileAction(enum.Enum):
@@ -6,10 +6,10 @@ import typing
 class SupportedMimeType(enum.Enum):
     @classmethod
     def from_value(cls, value: str) -> typing.Union["SupportedMimeType", None]:
-        for member in cls:
-            if member.value == value:
-                return member
-        return None
+        try:
+            return cls(value)  # enum's own value -> member map (no member scan)
+        except ValueError:
+            return None
 
     @classmethod
     def from_filename(cls, filename: str) -> typing.Union["SupportedMimeType", None]:
@@ -39,6 +39,10 @@ class WebDAVServerType(enum.Enum):
     NGINX = enum.auto()
 
 
+# Nginx autoindex date column, e.g. "05-Jan-2024 13:37"
+_NGINX_LS_DATE_RE = re.compile(r"(\d{1,2}-\w{3}-\d{4} \d{2}:\d{2})")
+
+
 def _parse_nginx_ls_size(size_text: str) -> int:
     """Convert Nginx size string to bytes (plain numbers only)"""
     if not size_text or size_text == "-":
@@ -47,6 +51,19 @@ def _parse_nginx_ls_size(size_text: str) -> int:
     return int(size_text)  # Size is always in bytes
 
 
+def _presigned_url_expiry(
+    expires_in_seconds: int,
+    max_step_in_seconds: int = 60 * 60,
+) -> int:
+    """
+    Absolute expiry timestamp, rounded up to a step (<= 10% of the lifetime)
+    so repeated requests within a step sign identical (browser-cacheable) URLs
+    """
+    step = max(1, min(expires_in_seconds // 10, max_step_in_seconds))
+    expires = int(datetime.datetime.now().timestamp()) + expires_in_seconds
+    return -(-expires // step) * step  # ceil to step
+
+
 class WebDAVIOHandler(libression.entities.io.IOHandler):
     def __init__(
         self,
@@ -208,7 +225,7 @@ class WebDAVIOHandler(libression.entities.io.IOHandler):
 
     def _presigned_url(
         self,
-        expires_in_seconds: int,
+        expires: int,
         file_key: str,
     ) -> str:
         """
@@ -218,9 +235,6 @@ class WebDAVIOHandler(libression.entities.io.IOHandler):
         - Returns folder1/file1.jpg ONLY
         No slash at the beginning or end (end should be a file name!)
         """
-        current_time = int(datetime.datetime.now().timestamp())
-        expires = current_time + expires_in_seconds
-
         # use spaces for secret key generation (not %20 or %2520)
         unencoded_file_key = url_full_unquote(file_key.lstrip("/"))
         encoded_file_key = urllib.parse.quote(unencoded_file_key)
@@ -251,10 +265,11 @@ class WebDAVIOHandler(libression.entities.io.IOHandler):
         """
 
         get_readonly_urls_response = dict()
+        expires = _presigned_url_expiry(expires_in_seconds)  # once per batch
 
         for file_key in file_keys:
             get_readonly_urls_response[file_key] = self._presigned_url(
-                expires_in_seconds, file_key
+                expires, file_key
             )
 
         return libression.entities.io.GetUrlsResponse(
@@ -386,27 +401,39 @@ class WebDAVIOHandler(libression.entities.io.IOHandler):
         dirpath: str,
         opened_client: httpx.AsyncClient,
         max_depth: int,
+        semaphore: asyncio.Semaphore,
         current_depth: int = 0,
     ) -> list[libression.entities.io.ListDirectoryObject]:
+        """
+        semaphore is shared by the whole recursion and bounds in-flight listings
+        (held per request only, so a parent never waits on its own children)
+        """
         if current_depth >= max_depth:
             return []
 
         results = []
 
         # Get initial directory listing
-        current_level = await self._list_single_directory(dirpath, opened_client)
+        async with semaphore:
+            current_level = await self._list_single_directory(dirpath, opened_client)
         results.extend(current_level)
 
-        # Recursively list subdirectories
-        for item in current_level:
-            if item.is_dir:
-                # Get full path for subdirectory
-                subdir_path = url_full_unquote(item.absolute_path)
-                # Recursively list contents
-                subdir_contents = await self._list_recursive(
-                    subdir_path, opened_client, max_depth, current_depth + 1
+        # Recursively list subdirectories (siblings concurrently, order preserved)
+        subdir_listings = await asyncio.gather(
+            *[
+                self._list_recursive(
+                    url_full_unquote(item.absolute_path),
+                    opened_client,
+                    max_depth,
+                    semaphore,
+                    current_depth + 1,
                 )
-                results.extend(subdir_contents)
+                for item in current_level
+                if item.is_dir
+            ]
+        )
+        for subdir_contents in subdir_listings:
+            results.extend(subdir_contents)
 
         return results
 
@@ -415,6 +442,7 @@ class WebDAVIOHandler(libression.entities.io.IOHandler):
         dirpath: str = "",
         subfolder_contents: bool = False,
         max_depth: int = 5,
+        max_concurrent_tasks: int = 10,
     ) -> list[libression.entities.io.ListDirectoryObject]:
         """List directory contents using GET request and parsing Nginx's autoindex
 
@@ -422,11 +450,17 @@ class WebDAVIOHandler(libression.entities.io.IOHandler):
             dirpath: The directory path to list
             subfolder_contents: If True, only show immediate contents (like ls)
                               If False, show all nested contents recursively
+            max_concurrent_tasks: Max directory listings in flight at once (recursive
+                              listing queues the rest instead of exhausting the
+                              client's connection pool)
         """
         async with self._create_httpx_client() as opened_client:
             if subfolder_contents:
                 return await self._list_recursive(
-                    dirpath, opened_client, max_depth=max_depth
+                    dirpath,
+                    opened_client,
+                    max_depth=max_depth,
+                    semaphore=asyncio.Semaphore(max_concurrent_tasks),
                 )
             else:
                 return await self._list_single_directory(dirpath, opened_client)
@@ -453,7 +487,7 @@ class WebDAVIOHandler(libression.entities.io.IOHandler):
 
         for line in lines:
             # Find the date-time pattern first
-            date_match = re.search(r"(\d{1,2}-\w{3}-\d{4} \d{2}:\d{2})", line)
+            date_match = _NGINX_LS_DATE_RE.search(line)
             if date_match:
                 # Split the line at the date to get the filename and size
                 parts = line.split(date_match.group(1))
@@ -503,7 +537,7 @@ class WebDAVIOHandler(libression.entities.io.IOHandler):
 
             # 405/409 means directory already exists, which is fine
             if response.status_code not in (201, 405, 409):
-                print(f"MKCOL failed with body: {response.text}")
+                logger.error(f"MKCOL failed for {current_path}/: {response.text}")
                 response.raise_for_status()
 
     async def _copy_single(
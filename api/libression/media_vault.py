@@ -1,6 +1,5 @@
 import io
 import logging
-import concurrent.futures
 import base64
 import libression.db.client
 import libression.entities.io
@@ -30,21 +29,34 @@ class ThumbnailFile(typing.NamedTuple):
     original_mime_type: libression.entities.media.SupportedMimeType
 
 
+# images -> jpeg, videos -> mp4 (flat lookup, built once)
+_THUMBNAIL_MIME_TYPE_BY_MIME_TYPE: dict[
+    libression.entities.media.SupportedMimeType,
+    libression.entities.media.SupportedMimeType,
+] = {
+    **{
+        mime_type: libression.entities.media.SupportedMimeType.JPEG
+        for mime_type in libression.entities.media.HEIC_PROCESSING_MIME_TYPES
+    },
+    **{
+        mime_type: libression.entities.media.SupportedMimeType.JPEG
+        for mime_type in libression.entities.media.OPEN_CV_PROCESSING_MIME_TYPES
+    },
+    **{
+        mime_type: libression.entities.media.SupportedMimeType.MP4
+        for mime_type in libression.entities.media.AV_PROCESSING_MIME_TYPES
+    },
+}
+
+
 def _thumbnail_type_from_mime_type(
     mime_type_enum: libression.entities.media.SupportedMimeType,
 ) -> libression.entities.media.SupportedMimeType | None:
     """
     images -> jpeg
-    videos -> gif
+    videos -> mp4
     """
-    if mime_type_enum in libression.entities.media.HEIC_PROCESSING_MIME_TYPES:
-        return libression.entities.media.SupportedMimeType.JPEG
-    if mime_type_enum in libression.entities.media.OPEN_CV_PROCESSING_MIME_TYPES:
-        return libression.entities.media.SupportedMimeType.JPEG
-    if mime_type_enum in libression.entities.media.AV_PROCESSING_MIME_TYPES:
-        return libression.entities.media.SupportedMimeType.MP4
-
-    return None
+    return _THUMBNAIL_MIME_TYPE_BY_MIME_TYPE.get(mime_type_enum)
 
 
 def thumbnail_file_from_original_file(
@@ -203,6 +215,74 @@ class MediaVault:
         )
         logger.info(f"Successfully saved thumbnail to cache: {thumbnail_file.key}")
 
+    async def _refresh_thumbnail(
+        self,
+        file_key: str,
+        presigned_url_expires_in_seconds: int,
+        semaphore: asyncio.Semaphore,
+    ) -> libression.entities.db.DBFileEntry | None:
+        """
+        Generate (on a worker thread) and cache the thumbnail for one file
+        Returns the new entry to register (None if the raw file was not found)
+        """
+        async with semaphore:
+            thumbnail_info, thumbnail_file = await asyncio.to_thread(
+                self._generate_thumbnail,
+                file_key=file_key,
+                presigned_url_expires_in_seconds=presigned_url_expires_in_seconds,
+            )
+
+            if (
+                thumbnail_file is not None
+                and thumbnail_info.raw_file_found
+                and thumbnail_info.thumbnail is not None
+            ):
+                try:
+                    await self._save_thumbnail_to_cache(
+                        thumbnail_info=thumbnail_info,
+                        thumbnail_file=thumbnail_file,
+                    )
+                except Exception as e:
+                    logger.error(f"Error saving thumbnail for {file_key}: {e}")
+
+        if not thumbnail_info.raw_file_found:
+            return None  # don't register to db at all
+
+        mime_type = (
+            thumbnail_file.original_mime_type.value
+            if thumbnail_file is not None
+            else None
+        )
+
+        thumbnail_key: str | None = None
+        thumbnail_mime_type: str | None = None
+        thumbnail_checksum: str | None = None
+        thumbnail_phash: str | None = None
+
+        if thumbnail_file is not None:  # fill thumbnail data if exists
+            if thumbnail_info.thumbnail:
+                thumbnail_key = thumbnail_file.key  # only specify if meaningful
+
+            thumbnail_checksum = thumbnail_info.checksum
+            thumbnail_phash = thumbnail_info.phash
+
+            thumbnail_mime_type_enum = thumbnail_file.thumbnail_mime_type
+            if thumbnail_mime_type_enum is None:
+                raise ValueError(
+                    f"Thumbnail exists but thumbnail mime type is None for file_key {file_key}"
+                )
+
+            thumbnail_mime_type = thumbnail_mime_type_enum.value
+
+        return libression.entities.db.new_db_file_entry(
+            file_key=file_key,
+            thumbnail_key=thumbnail_key,
+            thumbnail_mime_type=thumbnail_mime_type,
+            thumbnail_checksum=thumbnail_checksum,
+            thumbnail_phash=thumbnail_phash,
+            mime_type=mime_type,
+        )
+
     async def get_files_info(
         self,
         file_keys: list[str],
@@ -234,118 +314,35 @@ class MediaVault:
             file_key for file_key in file_keys if file_key not in found_file_keys
         ]
 
-        # Generate new thumbnails if needed
-        if file_keys_to_refresh:
-            # Process thumbnails in parallel to avoid memory issues
-            for batch in [
-                file_keys_to_refresh[i : i + max_concurrent_tasks]
-                for i in range(0, len(file_keys_to_refresh), max_concurrent_tasks)
-            ]:
-                batch_file_keys = list(batch)  # copy to avoid mutating original
-
-                thumbnail_results: dict[
-                    str, tuple[libression.thumbnail.ThumbnailInfo, ThumbnailFile | None]
-                ] = {}
-
-                # Generate the thumbnails in parallel (failed thumbnails will be Nones)
-                with concurrent.futures.ThreadPoolExecutor(
-                    max_workers=max_concurrent_tasks
-                ) as executor:
-                    future_to_key = {
-                        executor.submit(
-                            self._generate_thumbnail,
-                            file_key=file_key,
-                            presigned_url_expires_in_seconds=presigned_url_expires_in_seconds,
-                        ): file_key
-                        for file_key in batch_file_keys
-                    }
-
-                    for future in concurrent.futures.as_completed(future_to_key):
-                        result = future.result()  # result is key (easier index?)
-                        associated_file_key = future_to_key[future]
-                        thumbnail_results[associated_file_key] = result
-
-                # Save the thumbnails in parallel (to cache)
-                saving_tasks = []
-
-                for file_key, (
-                    thumbnail_info,
-                    thumbnail_file,
-                ) in thumbnail_results.items():
-                    # Skip validation if any of the following:
-                    if thumbnail_file is None:
-                        continue
-
-                    if thumbnail_info.raw_file_found is False:
-                        continue
-
-                    if thumbnail_info.thumbnail is None:
-                        continue
-
-                    saving_tasks.append(
-                        self._save_thumbnail_to_cache(
-                            thumbnail_info=thumbnail_info,
-                            thumbnail_file=thumbnail_file,
-                        )
-                    )
-
-                if saving_tasks:
-                    await asyncio.gather(*saving_tasks, return_exceptions=True)
-
-                # Register the file actions to DB
-                data_to_register: list[libression.entities.db.DBFileEntry] = []
+        if not file_keys_to_refresh:
+            return file_entries_from_db  # everything already known, no re-query
 
-                for file_key, (
-                    thumbnail_info,
-                    thumbnail_file,
-                ) in thumbnail_results.items():
-                    if not thumbnail_info.raw_file_found:
-                        continue  # don't register to db at all
-
-                    mime_type = (
-                        thumbnail_file.original_mime_type.value
-                        if thumbnail_file is not None
-                        else None
-                    )
+        # Generate new thumbnails
+        # Bounded concurrency across all keys (a slow file doesn't hold up a batch)
+        semaphore = asyncio.Semaphore(max_concurrent_tasks)
+        refreshed_entries = await asyncio.gather(
+            *[
+                self._refresh_thumbnail(
+                    file_key=file_key,
+                    presigned_url_expires_in_seconds=presigned_url_expires_in_seconds,
+                    semaphore=semaphore,
+                )
+                for file_key in file_keys_to_refresh
+            ]
+        )
 
-                    thumbnail_key: str | None = None
-                    thumbnail_mime_type: str | None = None
-                    thumbnail_checksum: str | None = None
-                    thumbnail_phash: str | None = None
-
-                    if thumbnail_file is not None:  # fill thumbnail data if exists
-                        if thumbnail_info.thumbnail:
-                            thumbnail_key = (
-                                thumbnail_file.key
-                            )  # only specify if meaningful
-
-                        thumbnail_checksum = thumbnail_info.checksum
-                        thumbnail_phash = thumbnail_info.phash
-
-                        thumbnail_mime_type_enum = thumbnail_file.thumbnail_mime_type
-                        if thumbnail_mime_type_enum is None:
-                            raise ValueError(
-                                f"Thumbnail exists but thumbnail mime type is None for file_key {file_key}"
-                            )
-
-                        thumbnail_mime_type = thumbnail_mime_type_enum.value
-
-                    row_to_register = libression.entities.db.new_db_file_entry(
-                        file_key=file_key,
-                        thumbnail_key=thumbnail_key,
-                        thumbnail_mime_type=thumbnail_mime_type,
-                        thumbnail_checksum=thumbnail_checksum,
-                        thumbnail_phash=thumbnail_phash,
-                        mime_type=mime_type,
-                    )
-                    data_to_register.append(row_to_register)
+        # Batch register all new entries to DB
+        data_to_register = [
+            file_entry for file_entry in refreshed_entries if file_entry is not None
+        ]
+        if not data_to_register:
+            return file_entries_from_db
 
-                # Batch register all new entries to DB
-                if data_to_register:
-                    self.db_client.register_file_action(data_to_register)
+        # Registered entries come back fully populated (no re-query needed),
+        # in insertion order: reverse to newest first, like the DB ordering
+        registered = self.db_client.register_file_action(data_to_register)
 
-        # Get updated entries including new thumbnails
-        return self.db_client.get_file_entries_by_file_keys(file_keys)
+        return list(reversed(registered)) + file_entries_from_db
 
     def get_thumbnail_presigned_urls(
         self,
@@ -465,17 +462,18 @@ class MediaVault:
             file_entries_with_key_mappings,
         )
 
-        # Copy data
-        data_copy_responses = await self.data_io_handler.copy(
-            file_key_mappings,
-            delete_source=delete_source,
+        # Copy data and thumbnails concurrently (independent stores)
+        data_copy_responses, _ = await asyncio.gather(
+            self.data_io_handler.copy(
+                file_key_mappings,
+                delete_source=delete_source,
+            ),
+            self.cache_io_handler.copy(
+                [x[1] for x in cache_key_mappings if x[1] is not None],
+                delete_source=delete_source,
+            ),  # currently ignore cache copy responses...
         )
 
-        await self.cache_io_handler.copy(
-            [x[1] for x in cache_key_mappings if x[1] is not None],
-            delete_source=delete_source,
-        )  # currently ignore ...
-
         # Register db
         file_actions_to_register = []
 
@@ -528,20 +526,11 @@ class MediaVault:
                     )
                     file_actions_to_register.append(row)
 
-            registered_entries = self.db_client.register_file_action(
-                file_actions_to_register
-            )
-
-            if not delete_source:  # COPY, so new file_entity_uuids need tags copied
-                self.db_client.register_file_tags(
-                    [
-                        libression.entities.db.DBTagEntry(
-                            file_entity_uuid=entry.file_entity_uuid,
-                            tags=entry.tags,
-                        )
-                        for entry in registered_entries
-                    ]
-                )  # register tags for new file_entity_uuid
+        # Register all actions once (COPY: new file_entity_uuids need tags copied)
+        self.db_client.register_files(
+            file_actions_to_register,
+            register_tags=not delete_source,
+        )
 
         return data_copy_responses
 
@@ -129,6 +129,7 @@ async def lifespan(app: fastapi.FastAPI) -> typing.AsyncGenerator[None, None]:
     yield
 
     # Cleanup (if needed)
+    db_client.close()
     app.state.media_vault = None
 
 
@@ -1,3 +1,4 @@
+import atexit
 import io
 import logging
 import typing
@@ -21,6 +22,14 @@ logger.setLevel(logging.DEBUG)
 
 pillow_heif.register_heif_opener()
 
+# Shared (thread-safe) client so thumbnail workers reuse keep-alive connections
+_HTTP_CLIENT = httpx.Client(
+    verify=False,
+    follow_redirects=True,
+    limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+)
+atexit.register(_HTTP_CLIENT.close)
+
 
 def _heif_thumbnail_from_pillow(
     byte_stream: typing.BinaryIO,
@@ -73,8 +82,8 @@ def _image_thumbnail_from_opencv(
         if not content:
             raise RuntimeError("Empty bytestream? shouldn't be here?")
 
-        # Read stream and convert to numpy array
-        file_bytes = numpy.asarray(bytearray(content), dtype=numpy.uint8)
+        # Zero-copy uint8 view over the encoded bytes (imdecode only reads it)
+        file_bytes = numpy.frombuffer(content, dtype=numpy.uint8)
         img = cv2.imdecode(file_bytes, cv2.IMREAD_COLOR)
 
         if img is None:
@@ -291,7 +300,7 @@ def generate_from_presigned_url(
     byte_stream: typing.BinaryIO | None = None
     try:
         logger.debug("Fetching content from presigned URL")
-        response = httpx.get(presigned_url, verify=False, follow_redirects=True)
+        response = _HTTP_CLIENT.get(presigned_url)
         response.raise_for_status()
         byte_stream = io.BytesIO(response.content)
 
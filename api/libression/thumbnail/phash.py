@@ -1,3 +1,4 @@
+import functools
 import io
 import logging
 
@@ -7,6 +8,22 @@ import PIL
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=64)
+def _grid_coords(length: int, pixels: int) -> numpy.ndarray:
+    """Evenly spaced sample indices along an axis (cached per size, read-only)"""
+    coords = numpy.linspace(0, length - 1, pixels).astype(int)
+    coords.setflags(write=False)  # shared by every caller of this size
+    return coords
+
+
+@functools.lru_cache(maxsize=8)
+def _bit_weights(bit_length: int) -> numpy.ndarray:
+    """Big-endian bit weights for packing a flattened grid into an int (read-only)"""
+    weights = 2 ** numpy.arange(bit_length)[::-1]
+    weights.setflags(write=False)  # shared by every caller of this size
+    return weights
+
+
 def _hash_single_image(image: PIL.Image.Image, pixels: int) -> str:
     """
     Generate perceptual hash from a single image (averaged over 4 rotations)
@@ -31,15 +48,18 @@ def _hash_single_image(image: PIL.Image.Image, pixels: int) -> str:
     bit_length = pixels * pixels
     hex_length = (bit_length + 3) // 4  # Round up to nearest hex char
 
+    weights = _bit_weights(bit_length)
+
     # Resize and hash all rotations
     hashes = []
     for arr in arrays:
         h, w = arr.shape
-        y_coords = numpy.linspace(0, h - 1, pixels).astype(int)
-        x_coords = numpy.linspace(0, w - 1, pixels).astype(int)
-        resized = arr[y_coords][:, x_coords]
+        y_coords = _grid_coords(h, pixels)
+        x_coords = _grid_coords(w, pixels)
+        # Single gather of the pixels x pixels grid (no full-width row copies)
+        resized = arr[numpy.ix_(y_coords, x_coords)]
         bits = (resized > resized.mean()).flatten()
-        hash_int = bits.dot(2 ** numpy.arange(bit_length)[::-1])
+        hash_int = bits.dot(weights)
         hashes.append(hash_int)
 
     # Use minimum hash value (canonical rotation)
@@ -10,7 +10,6 @@ import pathlib
 import time
 from aiohttp import web
 import asyncio
-import mimetypes
 
 
 @pytest.fixture
@@ -94,55 +93,8 @@ class _TestHttpFileServer:
         if not filepath.exists():
             return web.Response(status=404)
 
-        # Get file size and mime type
-        file_size = filepath.stat().st_size
-        content_type = mimetypes.guess_type(filepath)[0] or "application/octet-stream"
-
-        # Handle range requests
-        range_header = request.headers.get("Range")
-        start = 0
-        end = file_size - 1
-
-        if range_header:
-            try:
-                range_match = range_header.replace("bytes=", "").split("-")
-                start = int(range_match[0]) if range_match[0] else 0
-                end = int(range_match[1]) if range_match[1] else file_size - 1
-            except (ValueError, IndexError):
-                pass
-
-        # Prepare response headers
-        headers = {
-            "Content-Type": content_type,
-            "Content-Length": str(end - start + 1),
-            "Accept-Ranges": "bytes",
-            "Content-Range": f"bytes {start}-{end}/{file_size}"
-            if range_header
-            else None,
-        }
-        headers = {k: v for k, v in headers.items() if v is not None}
-
-        response = web.StreamResponse(
-            status=206 if range_header else 200,
-            reason="Partial Content" if range_header else "OK",
-            headers=headers,
-        )
-
-        await response.prepare(request)
-
-        # Stream file in chunks
-        chunk_size = 64 * 1024  # 64KB chunks
-        with open(filepath, "rb") as f:
-            f.seek(start)
-            bytes_remaining = end - start + 1
-            while bytes_remaining > 0:
-                chunk = f.read(min(chunk_size, bytes_remaining))
-                if not chunk:
-                    break
-                await response.write(chunk)
-                bytes_remaining -= len(chunk)
-
-        return response
+        # aiohttp serves Range requests (206 + Content-Range) via sendfile
+        return web.FileResponse(filepath)
 
     async def start_server(self):
         app = web.Application()
@@ -194,4 +146,6 @@ def db_client(tmp_path):
     db_path = tmp_path / "test.db"
     client = libression.db.client.DBClient(db_path)
 
-    return client
+    yield client
+
+    client.close()
@@ -1,5 +1,8 @@
+import sqlite3
+
 import pytest
 
+import libression.db.client
 import libression.entities.db
 
 
@@ -34,6 +37,180 @@ def test_register_file_action(db_client, sample_entries, dummy_file_key):
     assert len(state.tags) == 0  # No tags
 
 
+def test_register_file_action_many(db_client):
+    """Bulk registration spans several INSERT chunks and keeps entry order."""
+    entries = [
+        libression.entities.db.new_db_file_entry(file_key=f"bulk/{i}.jpg")
+        for i in range(250)
+    ]
+
+    registered = db_client.register_file_action(entries)
+    assert [x.file_key for x in registered] == [x.file_key for x in entries]
+    assert all(x.action_created_at is not None for x in registered)
+
+    states = db_client.get_file_entries_by_file_keys([x.file_key for x in entries])
+    assert {x.file_key for x in states} == {x.file_key for x in entries}
+
+
+def test_register_files_with_tags(db_client):
+    """Actions and their tags are registered together (one transaction)."""
+    entries = [
+        libression.entities.db.new_db_file_entry(
+            file_key=f"tagged/{i}.jpg", tags=[f"day{i}"]
+        )
+        for i in range(3)
+    ]
+
+    registered = db_client.register_files(entries, register_tags=True)
+    assert len(registered) == 3
+
+    states = db_client.get_file_entries_by_file_keys([x.file_key for x in entries])
+    assert {x.file_key: list(x.tags) for x in states} == {
+        f"tagged/{i}.jpg": [f"day{i}"] for i in range(3)
+    }
+
+
+def test_failed_write_rolls_back(db_client):
+    """A failed write leaves nothing behind and the pooled writer stays usable."""
+    good = libression.entities.db.new_db_file_entry(file_key="rollback/good.jpg")
+    bad = good._replace(file_key="rollback/bad.jpg", file_entity_uuid=None)
+
+    with pytest.raises(sqlite3.IntegrityError):
+        db_client.register_file_action([good, bad])
+
+    assert db_client.get_file_entries_by_file_keys(["rollback/good.jpg"]) == []
+
+    db_client.register_file_action([good])
+    assert len(db_client.get_file_entries_by_file_keys(["rollback/good.jpg"])) == 1
+
+
+def test_failed_tag_write_resets_tag_cache(db_client, monkeypatch):
+    """Tags upserted by a rolled-back write are not kept in the tag cache."""
+    sync_tags = db_client._sync_tags_by_tag_names
+
+    def sync_tags_then_fail(*args, **kwargs):
+        sync_tags(*args, **kwargs)
+        raise sqlite3.OperationalError("disk I/O error")
+
+    monkeypatch.setattr(db_client, "_sync_tags_by_tag_names", sync_tags_then_fail)
+    with pytest.raises(sqlite3.OperationalError):
+        db_client.register_files(
+            [
+                libression.entities.db.new_db_file_entry(
+                    file_key="a.jpg", tags=["beach"]
+                )
+            ],
+            register_tags=True,
+        )
+    monkeypatch.undo()
+
+    db_client.register_files(
+        [libression.entities.db.new_db_file_entry(file_key="a.jpg", tags=["beach"])],
+        register_tags=True,
+    )
+    (state,) = db_client.get_file_entries_by_file_keys(["a.jpg"])
+    assert list(state.tags) == ["beach"]
+
+
+def test_tags_registered_by_another_client(db_client, tmp_path):
+    """Tags already in the db (but not in this client's cache) resolve to the same id."""
+    db_client.register_files(
+        [libression.entities.db.new_db_file_entry(file_key="a.jpg", tags=["beach"])],
+        register_tags=True,
+    )  # warms the tag cache
+
+    other_client = libression.db.client.DBClient(tmp_path / "test.db")
+    try:
+        other_client.register_files(
+            [
+                libression.entities.db.new_db_file_entry(
+                    file_key="b.jpg", tags=["beach", "sunset", "dawn", "dusk"]
+                )
+            ],
+            register_tags=True,
+        )
+    finally:
+        other_client.close()
+
+    db_client.register_files(
+        [
+            libression.entities.db.new_db_file_entry(
+                file_key="c.jpg", tags=["sunset", "night"]
+            )
+        ],
+        register_tags=True,
+    )
+
+    # "dawn"/"dusk" were added by the other client: "dawn" is looked up by name,
+    # "dusk" by id (when resolving b.jpg's tags)
+    dawn = db_client.get_file_entries_by_tags(
+        include_tag_groups=[["dawn"]],
+        exclude_tags=[],
+    )
+    assert [f.file_key for f in dawn] == ["b.jpg"]
+    assert set(dawn[0].tags) == {"beach", "sunset", "dawn", "dusk"}
+
+    sunset = db_client.get_file_entries_by_tags(
+        include_tag_groups=[["sunset"]],
+        exclude_tags=[],
+    )
+    assert {f.file_key for f in sunset} == {"b.jpg", "c.jpg"}
+    assert set(next(f for f in sunset if f.file_key == "b.jpg").tags) == {
+        "beach",
+        "sunset",
+        "dawn",
+        "dusk",
+    }
+    assert set(next(f for f in sunset if f.file_key == "c.jpg").tags) == {
+        "sunset",
+        "night",
+    }
+
+
+def test_reads_during_inflight_write(db_client, sample_entries, dummy_file_key):
+    """Reads use their own snapshot and don't wait on an open write transaction."""
+    db_client.register_file_action(sample_entries)
+
+    with db_client._get_connection() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        db_client._insert_file_actions(
+            [libression.entities.db.new_db_file_entry(file_key="pending.jpg")],
+            conn.cursor(),
+        )
+
+        # Would raise "database is locked" if readers contended for the write lock
+        assert len(db_client.get_file_entries_by_file_keys([dummy_file_key])) == 1
+        assert db_client.get_file_entries_by_file_keys(["pending.jpg"]) == []
+        assert len(db_client.get_file_history(dummy_file_key)) == 1
+        assert len(db_client.find_similar_files(dummy_file_key)) == 1
+
+    assert len(db_client.get_file_entries_by_file_keys(["pending.jpg"])) == 1
+
+
+def test_file_entries_latest_tag_snapshot(db_client):
+    """Entries carry exactly the tags of their latest snapshot (no dupes/stale tags)."""
+    registered = db_client.register_files(
+        [
+            libression.entities.db.new_db_file_entry(
+                file_key="snapshot.jpg", tags=["initial", "shared"]
+            )
+        ],
+        register_tags=True,
+    )
+    db_client.register_file_tags(
+        [
+            libression.entities.db.DBTagEntry(
+                file_entity_uuid=registered[0].file_entity_uuid,
+                tags=["updated", "shared"],
+            )
+        ]
+    )
+
+    states = db_client.get_file_entries_by_file_keys(["snapshot.jpg"])
+    assert len(states) == 1
+    assert sorted(states[0].tags) == ["shared", "updated"]
+
+
 def test_file_history(db_client, sample_entries, dummy_file_key):
     """Test file history tracking."""
     # Create initial file
@@ -155,6 +332,103 @@ def test_complex_tag_queries(db_client):
     assert {f.file_key for f in results} == {"beach1.jpg", "mountain1.jpg"}
 
 
+def test_tag_queries_latest_state_only(db_client):
+    """Tag search only sees each file's latest tag snapshot and latest action."""
+    (created,) = db_client.register_files(
+        [libression.entities.db.new_db_file_entry(file_key="a.jpg", tags=["old"])],
+        register_tags=True,
+    )
+    db_client.register_file_tags(
+        [
+            libression.entities.db.DBTagEntry(
+                file_entity_uuid=created.file_entity_uuid, tags=["new"]
+            )
+        ]
+    )
+
+    assert db_client.get_file_entries_by_tags([["old"]], []) == []
+    (retagged,) = db_client.get_file_entries_by_tags([["new"]], [])
+    assert list(retagged.tags) == ["new"]
+
+    db_client.register_file_action(
+        [
+            libression.entities.db.existing_db_file_entry(
+                file_key="a.jpg",
+                file_entity_uuid=created.file_entity_uuid,
+                action_type=libression.entities.db.DBFileAction.DELETE,
+            )
+        ]
+    )
+    assert db_client.get_file_entries_by_tags([["new"]], []) == []
+
+
+def test_tag_queries_large_vocabulary(db_client):
+    """Tag queries stay correct across a large tag vocabulary."""
+    entries = [
+        libression.entities.db.new_db_file_entry(
+            file_key=f"file{i}.jpg",
+            tags=[f"tag{i}", "even" if i % 2 == 0 else "odd"],
+        )
+        for i in range(80)
+    ]
+    db_client.register_files(entries, register_tags=True)
+
+    matches = db_client.get_file_entries_by_tags(
+        include_tag_groups=[["tag70", "even"], ["tag75"], ["tag3", "even"]],
+        exclude_tags=["odd"],
+    )
+    assert [f.file_key for f in matches] == ["file70.jpg"]
+
+    evens = db_client.get_file_entries_by_tags(
+        include_tag_groups=[["even"]],
+        exclude_tags=["tag78"],
+    )
+    assert len(evens) == 39
+
+
+def test_tag_queries_duplicate_tags(db_client):
+    """A tag repeated in a file's snapshot counts once."""
+    db_client.register_files(
+        [
+            libression.entities.db.new_db_file_entry(
+                file_key="other.jpg", tags=["t1", "t2", "t3"]
+            ),
+            libression.entities.db.new_db_file_entry(
+                file_key="dup.jpg", tags=["t2", "t2"]
+            ),
+        ],
+        register_tags=True,
+    )
+
+    matches = db_client.get_file_entries_by_tags([["t2"]], [])
+    assert {f.file_key for f in matches} == {"other.jpg", "dup.jpg"}
+
+    matches = db_client.get_file_entries_by_tags([["t3"]], [])
+    assert [f.file_key for f in matches] == ["other.jpg"]
+
+    matches = db_client.get_file_entries_by_tags([["t2"]], ["t3"])
+    assert [f.file_key for f in matches] == ["dup.jpg"]
+
+
+def test_tag_queries_empty_group(db_client):
+    """An empty include group matches no files."""
+    db_client.register_files(
+        [
+            libression.entities.db.new_db_file_entry(
+                file_key=f"file{i}.jpg", tags=[f"tag{i}"]
+            )
+            for i in range(2)
+        ],
+        register_tags=True,
+    )
+
+    assert db_client.get_file_entries_by_tags([[]], []) == []
+    assert db_client.get_file_entries_by_tags([[]], ["tag0"]) == []
+
+    matches = db_client.get_file_entries_by_tags([[], ["tag1"]], [])
+    assert [f.file_key for f in matches] == ["file1.jpg"]
+
+
 def test_tag_history(db_client):
     """Test tag history tracking."""
     entries = [
@@ -195,6 +469,24 @@ def test_tag_history(db_client):
     assert history[1][1] == {"initial", "tags"}
 
 
+def test_tag_names_with_commas(db_client):
+    """Tag names are aggregated as JSON arrays, so commas in names survive."""
+    db_client.register_files(
+        [
+            libression.entities.db.new_db_file_entry(
+                file_key="paris.jpg", tags=["Paris, France", "trip"]
+            )
+        ],
+        register_tags=True,
+    )
+
+    history = db_client.get_tag_history("paris.jpg")
+    assert history[0][1] == {"Paris, France", "trip"}
+
+    (entry,) = db_client.get_file_entries_by_file_keys(["paris.jpg"])
+    assert set(entry.tags) == {"Paris, France", "trip"}
+
+
 def test_tag_operations(db_client):
     """Test tag-based file queries."""
     # Create files with different tags
@@ -281,6 +573,21 @@ def test_tag_operations(db_client):
     assert len(vacation_spots_no_winter) == 1
     assert vacation_spots_no_winter[0].file_key == "beach1.jpg"
 
+    # Unknown tags: an include group needing one can't match, excludes are no-ops
+    assert (
+        db_client.get_file_entries_by_tags(
+            include_tag_groups=[["vacation", "no_such_tag"]], exclude_tags=[]
+        )
+        == []
+    )
+    assert {
+        f.file_key
+        for f in db_client.get_file_entries_by_tags(
+            include_tag_groups=[["no_such_tag"], ["work"]],
+            exclude_tags=["also_no_such_tag"],
+        )
+    } == {"work1.jpg", "private1.jpg", "draft1.jpg"}
+
     # Test file history
     original_uuid = registered[0].file_entity_uuid
     moved = libression.entities.db.existing_db_file_entry(
@@ -348,6 +655,16 @@ def test_similar_files(db_client, sample_entries, dummy_file_key):
     assert any(f.file_key == "similar.jpg" for f in similar_files)
 
 
+def test_similar_files_latest_action_only(db_client, sample_entries, dummy_file_key):
+    """Several actions in the same second yield one (latest) row per file."""
+    db_client.register_file_action(sample_entries)
+    rerun = sample_entries[0]._replace(thumbnail_key="thumb_rerun.jpg")
+    db_client.register_file_action([rerun])  # same CURRENT_TIMESTAMP second
+
+    similar_files = db_client.find_similar_files(dummy_file_key)
+    assert [f.thumbnail_key for f in similar_files] == ["thumb_rerun.jpg"]
+
+
 def test_error_cases(db_client):
     """Test error handling."""
     # Test empty register
@@ -1,6 +1,8 @@
+import asyncio
 import pytest
 import httpx
 import io
+import time
 import uuid
 from libression.entities.io import FileStreamInfos, FileStreamInfo, FileKeyMapping
 import libression.io_handler.webdav
@@ -87,6 +89,35 @@ async def test_get_readonly_urls(
     assert "://" in response.base_url  # protocol is present
 
 
+def test_get_readonly_urls_stable_within_expiry_step(docker_webdav_io_handler):
+    # Pure URL signing (no server round trip)
+    expires_in_seconds = 3600
+    earliest_expiry = int(time.time()) + expires_in_seconds
+
+    first = docker_webdav_io_handler.get_readonly_urls(
+        ["a/b.jpg", "c.png"], expires_in_seconds=expires_in_seconds
+    )
+    second = docker_webdav_io_handler.get_readonly_urls(
+        ["c.png"], expires_in_seconds=expires_in_seconds
+    )
+
+    # Rounded expiry is shared by the batch and never shorter than requested
+    expiries = {int(path.split("expires=")[1]) for path in first.paths.values()}
+    assert len(expiries) == 1
+    assert expiries.pop() >= earliest_expiry
+
+    # Same key within the same step -> identical (browser-cacheable) URL
+    # (retry once in case the two calls straddled a step boundary)
+    if second.paths["c.png"] != first.paths["c.png"]:
+        first = docker_webdav_io_handler.get_readonly_urls(
+            ["c.png"], expires_in_seconds=expires_in_seconds
+        )
+        second = docker_webdav_io_handler.get_readonly_urls(
+            ["c.png"], expires_in_seconds=expires_in_seconds
+        )
+    assert second.paths["c.png"] == first.paths["c.png"]
+
+
 @pytest.mark.asyncio
 @pytest.mark.parametrize("io_handler_fixture_name", ["docker_webdav_io_handler"])
 async def test_delete(
@@ -604,3 +635,43 @@ async def test_list_objects_filenames_with_spaces(
     finally:
         # Clean up all files and directories
         await io_handler.delete([unquoted_filename, copy_filename])
+
+
+@pytest.mark.asyncio
+async def test_list_objects_recursive_bounded_concurrency(docker_webdav_io_handler):
+    # Mocked nginx autoindex JSON (no server round trip): a wide two-level tree
+    in_flight = 0
+    max_in_flight = 0
+
+    async def autoindex(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+
+        depth = request.url.path.rstrip("/").count("/") - 1  # below url_path
+        entry_type = "directory" if depth < 2 else "file"
+        return httpx.Response(
+            200,
+            json=[
+                {
+                    "name": f"entry{i}",
+                    "type": entry_type,
+                    "mtime": "Mon, 01 Jan 2024 00:00:00 GMT",
+                    "size": 1,
+                }
+                for i in range(6)
+            ],
+        )
+
+    docker_webdav_io_handler._create_httpx_client = lambda: httpx.AsyncClient(
+        transport=httpx.MockTransport(autoindex)
+    )
+
+    objects = await docker_webdav_io_handler.list_objects(
+        subfolder_contents=True, max_concurrent_tasks=3
+    )
+
+    assert len(objects) == 6 + 6 * 6 + 6 * 6 * 6
+    assert max_in_flight == 3  # 43 listings queued behind the semaphore
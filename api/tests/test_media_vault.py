@@ -159,6 +159,58 @@ async def test_get_files_info_existing_thumbnails(
     await media_vault.delete([result[0]])
 
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "io_handler_fixture_name, media_fixture_by_filename",
+    [
+        ("docker_webdav_io_handler", "minimal.png"),
+    ],
+    indirect=["media_fixture_by_filename"],
+)
+async def test_get_files_info_order(
+    db_client,
+    io_handler_fixture_name,
+    request: pytest.FixtureRequest,
+    media_fixture_by_filename,
+):
+    file_keys = [f"{uuid.uuid4()}.png" for _ in range(4)]
+
+    io_handler = request.getfixturevalue(io_handler_fixture_name)
+    media_vault = MediaVault(
+        data_io_handler=io_handler,
+        cache_io_handler=io_handler,
+        db_client=db_client,
+        thumbnail_width_in_pixels=200,
+        chunk_byte_size=8192,
+    )
+
+    await io_handler.upload(
+        libression.entities.io.FileStreamInfos(
+            file_streams={
+                file_key: libression.entities.io.FileStreamInfo(
+                    file_stream=io.BytesIO(media_fixture_by_filename),
+                    mime_type=libression.entities.media.SupportedMimeType.PNG,
+                )
+                for file_key in file_keys
+            }
+        )
+    )
+
+    # Some keys already known, the rest newly registered
+    await media_vault.get_files_info(file_keys[:2])
+    result = await media_vault.get_files_info(file_keys)
+
+    # Same order as a DB read (newest first), refreshed or not
+    db_order = [
+        entry.file_key for entry in db_client.get_file_entries_by_file_keys(file_keys)
+    ]
+    assert [entry.file_key for entry in result] == db_order
+    assert db_order[:2] == file_keys[:1:-1]  # newly registered, newest first
+
+    # Teardown
+    await media_vault.delete(result)
+
+
 @pytest.mark.asyncio
 @pytest.mark.parametrize(
     "io_handler_fixture_name, media_fixture_by_filename",
@@ -148,3 +148,16 @@ def test_phash_pixel_value_invariance():
     hash2 = libression.thumbnail.phash.phash_from_thumbnail(to_bytes(img2))
 
     assert hash1 == hash2  # Should match as relative brightness is same
+
+
+def test_phash_cached_arrays_are_read_only():
+    """Cached grid coords/bit weights are shared, so they must not be writable."""
+    coords = libression.thumbnail.phash._grid_coords(100, 4)
+    weights = libression.thumbnail.phash._bit_weights(16)
+
+    with pytest.raises(ValueError):
+        coords += 1
+    with pytest.raises(ValueError):
+        weights[0] = 0
+
+    assert coords.tolist() == [0, 33, 66, 99]
@@ -26,7 +26,7 @@ def mock_presigned_url() -> str:
 
 @pytest.fixture
 def mock_http_response(sample_image):
-    """Mock httpx.get response"""
+    """Mock shared httpx client .get response"""
     mock_response = Mock()
     mock_response.content = sample_image
     mock_response.raise_for_status = Mock()
@@ -47,7 +47,9 @@ def test_generate_thumbnail_info_success(mock_presigned_url, mock_http_response)
     """Test successful generation of thumbnail components"""
     width = 100
 
-    with patch("httpx.get", return_value=mock_http_response):
+    with patch(
+        "libression.thumbnail.image._HTTP_CLIENT.get", return_value=mock_http_response
+    ):
         result = libression.thumbnail.generate_thumbnail_info(
             mock_presigned_url,
             libression.entities.media.SupportedMimeType.JPEG,
@@ -73,7 +75,9 @@ def test_generate_thumbnail_info_invalid_image(mock_presigned_url):
     mock_response.content = b"not an image"
     mock_response.raise_for_status = Mock()
 
-    with patch("httpx.get", return_value=mock_response):
+    with patch(
+        "libression.thumbnail.image._HTTP_CLIENT.get", return_value=mock_response
+    ):
         result = libression.thumbnail.generate_thumbnail_info(
             mock_presigned_url,
             libression.entities.media.SupportedMimeType.JPEG,
@@ -94,7 +98,9 @@ def test_generate_thumbnail_info_respects_width(mock_presigned_url, large_image)
     mock_response.content = large_image
     mock_response.raise_for_status = Mock()
 
-    with patch("httpx.get", return_value=mock_response):
+    with patch(
+        "libression.thumbnail.image._HTTP_CLIENT.get", return_value=mock_response
+    ):
         result = libression.thumbnail.generate_thumbnail_info(
             mock_presigned_url,
             libression.entities.media.SupportedMimeType.JPEG,